@@ -0,0 +1,106 @@
+"""
+Cache Helper Functions
+
+Shared key/value cache for read-mostly data. Uses Redis when REDIS_URL is set
+so every worker sees the same entries; otherwise falls back to an in-process
+cache with the same per-key TTL semantics.
+"""
+
+import logging
+import os
+from typing import Any, Optional
+
+import orjson
+from cachetools import TLRUCache
+from dotenv import load_dotenv
+from redis import RedisError
+from redis.asyncio import Redis
+
+# Load environment variables from .env file
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+redis_client = None
+
+redis_url = os.getenv("REDIS_URL")
+
+if redis_url:
+    redis_client = Redis.from_url(redis_url)
+
+# Local fallback: values are stored as (ttl_seconds, value)
+_local = TLRUCache(maxsize=1024, ttu=lambda _key, item, now: now + item[0])
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached value for key, or None on a miss (Redis errors count as a miss)"""
+    if redis_client is not None:
+        try:
+            raw = await redis_client.get(key)
+        except RedisError:
+            logger.warning("cache get failed for %s", key, exc_info=True)
+            return None
+        return orjson.loads(raw) if raw is not None else None
+    item = _local.get(key)
+    return item[1] if item is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int):
+    """Store value under key for ttl seconds (best effort)"""
+    if redis_client is not None:
+        try:
+            await redis_client.setex(key, ttl, orjson.dumps(value, default=str))
+        except RedisError:
+            logger.warning("cache set failed for %s", key, exc_info=True)
+    else:
+        _local[key] = (ttl, value)
+
+
+async def cache_get_bytes(key: str) -> Optional[bytes]:
+    """Like cache_get, for values that are already encoded bytes"""
+    if redis_client is not None:
+        try:
+            return await redis_client.get(key)
+        except RedisError:
+            logger.warning("cache get failed for %s", key, exc_info=True)
+            return None
+    item = _local.get(key)
+    return item[1] if item is not None else None
+
+
+async def cache_set_bytes(key: str, value: bytes, ttl: int):
+    """Like cache_set, storing value as-is instead of JSON-encoding it"""
+    if redis_client is not None:
+        try:
+            await redis_client.setex(key, ttl, value)
+        except RedisError:
+            logger.warning("cache set failed for %s", key, exc_info=True)
+    else:
+        _local[key] = (ttl, value)
+
+
+async def cache_delete(*keys: str):
+    """Drop the given keys (best effort)"""
+    if redis_client is not None:
+        if keys:
+            try:
+                await redis_client.delete(*keys)
+            except RedisError:
+                logger.warning("cache delete failed for %s", keys, exc_info=True)
+    else:
+        for key in keys:
+            _local.pop(key, None)
+
+
+async def cache_delete_prefix(prefix: str):
+    """Drop every key starting with prefix (best effort)"""
+    if redis_client is not None:
+        try:
+            keys = [key async for key in redis_client.scan_iter(match=f"{prefix}*")]
+            if keys:
+                await redis_client.delete(*keys)
+        except RedisError:
+            logger.warning("cache delete failed for prefix %s", prefix, exc_info=True)
+    else:
+        for key in [k for k in _local.keys() if k.startswith(prefix)]:
+            _local.pop(key, None)
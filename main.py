@@ -1,18 +1,47 @@
+import asyncio
+import hashlib
 import os
+import re
+import secrets
+import weakref
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
-from fastapi import FastAPI, HTTPException
+from typing import List, Optional, Tuple
+import orjson
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import OperationFailure
 
-from database import db, create_document, get_documents
+from cache import cache_delete, cache_get, cache_get_bytes, cache_set, cache_set_bytes
+from database import db, create_document, create_documents, ensure_indexes, get_documents
 
-app = FastAPI(title="HANDIQ API")
+UTC = timezone.utc
+
+# Collection handles resolved once instead of on every request
+WORKSHOP_COL = db["workshop"] if db is not None else None
+SESSION_COL = db["session"] if db is not None else None
+BOOKING_COL = db["booking"] if db is not None else None
+REVIEW_COL = db["review"] if db is not None else None
+
+
+def dumps(content) -> bytes:
+    # orjson handles datetimes natively; fall back to str() for ObjectId
+    return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+class APIResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+app = FastAPI(title="HANDIQ API", default_response_class=APIResponse)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -20,139 +49,133 @@ app.add_middleware(
 
 # ----- Utilities -----
 
+_is_oid = re.compile(r"[0-9a-fA-F]{24}").fullmatch
+
+
 def oid(id_str: str) -> ObjectId:
-    try:
-        return ObjectId(id_str)
-    except Exception:
+    # ObjectIds are exactly 24 hex chars; reject anything else without raising inside bson
+    if not _is_oid(id_str):
         raise HTTPException(status_code=400, detail="Invalid id")
+    return ObjectId(id_str)
 
 
 def serialize(doc: dict) -> dict:
-    if not doc:
-        return doc
-    d = doc.copy()
-    _id = d.get("_id")
-    if _id:
-        d["id"] = str(_id)
-        del d["_id"]
-    # Convert datetimes to iso
-    for k, v in list(d.items()):
-        if isinstance(v, datetime):
-            d[k] = v.isoformat()
-    return d
-
-
-# ----- Seed Data on Startup -----
-
-WORKSHOPS = [
-    {
-        "title": "Scrapbooking Workshop",
-        "slug": "scrapbooking",
-        "description": "Create calming, memory-filled pages with premium papers and embellishments.",
-        "price": 1999.0,
-        "duration_minutes": 120,
-        "location": "HANDIQ Studio, Indiranagar",
-        "instructor": "Aisha Kapoor",
-        "includes": ["All materials", "Tea & snacks", "Take-home kit"],
-        "images": [
-            "https://images.unsplash.com/photo-1519681393784-d120267933ba",
-        ],
-        "what_you_learn": ["Layering", "Composition", "Binding"],
-        "materials_provided": ["Papers", "Stickers", "Glue", "Cutters"],
-        "accent_color": "#B58E6D",
-    },
-    {
-        "title": "Pottery Workshop",
-        "slug": "pottery",
-        "description": "Mindful clay play: hand-building, wheel basics, glazing.",
-        "price": 2499.0,
-        "duration_minutes": 150,
-        "location": "HANDIQ Studio, Indiranagar",
-        "instructor": "Raghav Menon",
-        "includes": ["Clay & tools", "Firing & glazing", "Refreshments"],
-        "images": [
-            "https://images.unsplash.com/photo-1513342791620-8d83f05df3fc",
-        ],
-        "what_you_learn": ["Coiling", "Pinching", "Wheel basics"],
-        "materials_provided": ["Clay", "Tools", "Apron"],
-        "accent_color": "#3F6E73",
-    },
-    {
-        "title": "Resin Art Workshop",
-        "slug": "resin-art",
-        "description": "Create glossy, ocean-like pours with resin and pigments.",
-        "price": 2899.0,
-        "duration_minutes": 120,
-        "location": "HANDIQ Studio, Indiranagar",
-        "instructor": "Naina Shah",
-        "includes": ["Resin & pigments", "Safety gear", "Coasters to take home"],
-        "images": [
-            "https://images.unsplash.com/photo-1604076936065-c6e5f0505f01",
-        ],
-        "what_you_learn": ["Mixing", "Pouring", "Finishing"],
-        "materials_provided": ["Resin", "Pigments", "Gloves", "Masks"],
-        "accent_color": "#F5B21A",
-    },
-    {
-        "title": "Embroidery Workshop",
-        "slug": "embroidery",
-        "description": "Slow-stitch your calm with modern embroidery techniques.",
-        "price": 1799.0,
-        "duration_minutes": 120,
-        "location": "HANDIQ Studio, Indiranagar",
-        "instructor": "Meera Iyer",
-        "includes": ["Hoop, needles, threads", "Design templates", "Snacks"],
-        "images": [
-            "https://images.unsplash.com/photo-1600431521340-491eca880813",
-        ],
-        "what_you_learn": ["Backstitch", "Satin stitch", "French knots"],
-        "materials_provided": ["Hoop", "Fabric", "Threads", "Needles"],
-        "accent_color": "#E8DCCF",
-    },
-]
+    # Mutates in place: pass a copy when the original doc is shared (e.g. cached)
+    if doc and "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
+    return doc
 
 
-def ensure_seed():
-    if db is None:
-        return
-    if db["workshop"].count_documents({}) == 0:
-        for w in WORKSHOPS:
-            create_document("workshop", w)
-    # Seed rolling sessions for next days
-    if db["session"].count_documents({}) == 0:
-        now = datetime.now(timezone.utc)
-        for w in WORKSHOPS:
-            for d in range(1, 10):
-                start = now + timedelta(days=d, hours=10)
-                end = start + timedelta(minutes=w["duration_minutes"]) if "duration_minutes" in w else start + timedelta(minutes=120)
-                create_document(
-                    "session",
-                    {
-                        "workshop_slug": w["slug"],
-                        "start_time": start,
-                        "end_time": end,
-                        "capacity": 10,
-                    },
-                )
+def make_etag(body: bytes) -> str:
+    # Strong ETag: quoted md5 hex digest, always 34 characters
+    return f'"{hashlib.md5(body).hexdigest()}"'
+
+
+def conditional_response(request: Request, content, etag: Optional[str] = None,
+                         cache_control: str = "public, max-age=60") -> Response:
+    # Answers 304 when the client copy is current; pass etag when it is already known
+    body = content if isinstance(content, bytes) else dumps(content)
+    etag = etag or make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in [t.strip().removeprefix("W/") for t in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# ----- Projections -----
+
+# Fields rendered by the workshop card grid and the session picker
+WORKSHOP_CARD_FIELDS = {
+    "title": 1,
+    "slug": 1,
+    "price": 1,
+    "duration_minutes": 1,
+    "images": {"$slice": 1},
+    "accent_color": 1,
+}
+SESSION_LIST_FIELDS = {"start_time": 1, "end_time": 1, "capacity": 1, "booked_seats": 1}
+
+
+# ----- Read Caches -----
+
+# Workshop docs change rarely; keep them cached for a few minutes.
+# Keys are "workshop:<slug>" plus "workshop:__all__" for the encoded listing body.
+WORKSHOP_TTL = 300
+# Session lists carry seat counts, so keep them short-lived and drop them on bookings
+SESSIONS_TTL = 30
+
+# One lock per key being (re)loaded, so concurrent misses within a worker share a
+# single query; entries disappear once no request is waiting on them
+_miss_locks = weakref.WeakValueDictionary()
+
+
+async def cached(key: str, load, ttl: int, raw: bool = False):
+    # raw=True caches bytes as-is (e.g. a pre-encoded response body)
+    get, set_ = (cache_get_bytes, cache_set_bytes) if raw else (cache_get, cache_set)
+    value = await get(key)
+    if value is not None:
+        return value
+    lock = _miss_locks.get(key)
+    if lock is None:
+        lock = _miss_locks[key] = asyncio.Lock()
+    async with lock:
+        value = await get(key)
+        if value is None:
+            value = await load()
+            if value is not None:
+                await set_(key, value, ttl)
+    return value
+
+
+_ETAG_LEN = 34
+
+
+async def _load_workshops_body() -> bytes:
+    items = [serialize(w) for w in await get_documents("workshop", projection=WORKSHOP_CARD_FIELDS)]
+    body = dumps({"items": items})
+    # Stored as ETag followed by body so both live in one cache entry
+    return make_etag(body).encode() + body
+
+
+async def cached_workshops_body() -> Tuple[bytes, str]:
+    # The listing is cached already encoded and hashed, so a hit (or a 304) costs
+    # no orjson or md5 work
+    packed = await cached("workshop:__all__", _load_workshops_body, WORKSHOP_TTL, raw=True)
+    return packed[_ETAG_LEN:], packed[:_ETAG_LEN].decode()
+
+
+async def cached_workshop(slug: str) -> Optional[dict]:
+    async def load():
+        w = await WORKSHOP_COL.find_one({"slug": slug})
+        return serialize(w) if w else None
+
+    return await cached(f"workshop:{slug}", load, WORKSHOP_TTL)
 
 
 @app.on_event("startup")
 async def startup_event():
-    ensure_seed()
+    # Seeding runs once per deploy via `python -m scripts.seed`; indexes are cheap to re-check
+    await ensure_indexes()
 
 
 # ----- Models for requests -----
 
 class BookingRequest(BaseModel):
+    # Immutable once parsed; unknown fields are rejected
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     workshop_slug: str
     session_id: str
     customer_name: str
     customer_email: EmailStr
     customer_phone: Optional[str] = None
-    seats: int = 1
+    seats: int = Field(1, ge=1, le=10)
 
 
 class PaymentConfirmRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     booking_id: str
     payment_reference: str
 
@@ -160,92 +183,123 @@ class PaymentConfirmRequest(BaseModel):
 # ----- Public API -----
 
 @app.get("/")
-def root():
+async def root():
     return {"brand": "HANDIQ", "status": "ok"}
 
 
 @app.get("/api/workshops")
-def get_workshops():
-    items = [serialize(w) for w in get_documents("workshop")]
-    return {"items": items}
+async def get_workshops(request: Request):
+    if db is None:
+        return conditional_response(request, {"items": []})
+    body, etag = await cached_workshops_body()
+    return conditional_response(request, body, etag)
 
 
 @app.get("/api/workshops/{slug}")
-def get_workshop(slug: str):
-    w = db["workshop"].find_one({"slug": slug})
+async def get_workshop(slug: str, request: Request):
+    w = await cached_workshop(slug)
     if not w:
         raise HTTPException(404, "Workshop not found")
     # fetch sessions
-    now = datetime.now(timezone.utc)
-    sessions = db["session"].find({"workshop_slug": slug, "start_time": {"$gte": now}}).sort("start_time", 1).limit(10)
-    return {"workshop": serialize(w), "sessions": [serialize(s) for s in sessions]}
+    now = datetime.now(UTC)
+    sessions = await SESSION_COL.find({"workshop_slug": slug, "start_time": {"$gte": now}}).sort("start_time", 1).limit(10).to_list(length=10)
+    # Sessions carry live seat counts: let browsers revalidate via ETag, keep CDNs out
+    return conditional_response(
+        request,
+        {"workshop": w, "sessions": [serialize(s) for s in sessions]},
+        cache_control="private, no-cache",
+    )
 
 
 @app.get("/api/sessions/next")
-def next_session():
-    now = datetime.now(timezone.utc)
-    s = db["session"].find({"start_time": {"$gte": now}}).sort("start_time", 1).limit(1)
-    sess = list(s)
+async def next_session():
+    now = datetime.now(UTC)
+    sess = await SESSION_COL.find({"start_time": {"$gte": now}}).sort("start_time", 1).limit(1).to_list(length=1)
     if not sess:
         return {"item": None}
     session = sess[0]
-    w = db["workshop"].find_one({"slug": session["workshop_slug"]})
+    w = await WORKSHOP_COL.find_one({"slug": session["workshop_slug"]})
     item = serialize(session)
     item["workshop_title"] = w["title"] if w else session["workshop_slug"]
-    # calculate available seats
-    booked = db["booking"].aggregate([
-        {"$match": {"session_id": str(session["_id"]), "status": {"$in": ["pending_payment", "confirmed"]}}},
-        {"$group": {"_id": None, "seats": {"$sum": "$seats"}}},
-    ])
-    total_booked = next(booked, {"seats": 0}).get("seats", 0)
-    item["available_seats"] = max(0, session["capacity"] - total_booked)
+    # available seats from the denormalized counter
+    item["available_seats"] = max(0, session["capacity"] - session.get("booked_seats", 0))
     return {"item": item}
 
 
 @app.get("/api/sessions")
-def sessions_for_workshop(workshop: str):
-    now = datetime.now(timezone.utc)
-    sessions = db["session"].find({"workshop_slug": workshop, "start_time": {"$gte": now}}).sort("start_time", 1)
-    items = [serialize(s) for s in sessions]
+async def sessions_for_workshop(workshop: str):
+    items = await cache_get(f"sessions:{workshop}")
+    if items is None:
+        now = datetime.now(UTC)
+        sessions = SESSION_COL.find({"workshop_slug": workshop, "start_time": {"$gte": now}}, SESSION_LIST_FIELDS, batch_size=200).sort("start_time", 1)
+        items = [serialize(s) async for s in sessions]
+        await cache_set(f"sessions:{workshop}", items, SESSIONS_TTL)
     return {"items": items}
 
 
-@app.post("/api/bookings")
-def create_booking(payload: BookingRequest):
-    # Check workshop & session
-    w = db["workshop"].find_one({"slug": payload.workshop_slug})
-    if not w:
-        raise HTTPException(404, "Workshop not found")
-    s = db["session"].find_one({"_id": oid(payload.session_id)})
-    if not s or s["workshop_slug"] != payload.workshop_slug:
-        raise HTTPException(400, "Invalid session")
-    # Seats availability
-    booked = db["booking"].aggregate([
-        {"$match": {"session_id": payload.session_id, "status": {"$in": ["pending_payment", "confirmed"]}}},
-        {"$group": {"_id": None, "seats": {"$sum": "$seats"}}},
-    ])
-    total_booked = next(booked, {"seats": 0}).get("seats", 0)
-    available = s["capacity"] - total_booked
-    if payload.seats > available:
-        raise HTTPException(400, detail=f"Only {available} seats left")
+# Cleared the first time the server rejects a transaction (standalone mongod)
+_transactions_supported = True
 
-    amount = float(w.get("price", 0)) * payload.seats
-    booking_id = create_document(
-        "booking",
+
+async def run_in_transaction(fn):
+    # Runs fn(session) in a transaction; with_transaction retries write conflicts
+    # between concurrent requests. On a standalone mongod fn(None) runs instead.
+    global _transactions_supported
+    if _transactions_supported:
+        try:
+            async with await db.client.start_session() as txn:
+                return await txn.with_transaction(fn)
+        except OperationFailure as e:
+            # IllegalOperation: transactions need a replica set or mongos
+            if e.code != 20:
+                raise
+            _transactions_supported = False
+    return await fn(None)
+
+
+async def _reserve_and_book(payload: BookingRequest, sid: ObjectId, amount: float, txn=None) -> str:
+    # Check and reserve seats in one conditional update
+    updated = await SESSION_COL.find_one_and_update(
         {
+            "_id": sid,
             "workshop_slug": payload.workshop_slug,
-            "session_id": payload.session_id,
-            "customer_name": payload.customer_name,
-            "customer_email": payload.customer_email,
-            "customer_phone": payload.customer_phone,
-            "seats": payload.seats,
-            "amount": amount,
-            "status": "pending_payment",
+            "$expr": {"$lte": [{"$add": [{"$ifNull": ["$booked_seats", 0]}, payload.seats]}, "$capacity"]},
         },
+        {"$inc": {"booked_seats": payload.seats}},
+        return_document=ReturnDocument.AFTER,
+        session=txn,
     )
+    if not updated:
+        # Slow path: work out why the update did not match
+        s = await SESSION_COL.find_one({"_id": sid}, session=txn)
+        if not s or s["workshop_slug"] != payload.workshop_slug:
+            raise HTTPException(400, "Invalid session")
+        available = max(0, s["capacity"] - s.get("booked_seats", 0))
+        raise HTTPException(400, detail=f"Only {available} seats left")
+
+    try:
+        booking_id = await create_document(
+            "booking",
+            {
+                "workshop_slug": payload.workshop_slug,
+                "session_id": payload.session_id,
+                "customer_name": payload.customer_name,
+                "customer_email": payload.customer_email,
+                "customer_phone": payload.customer_phone,
+                "seats": payload.seats,
+                "amount": amount,
+                "status": "pending_payment",
+            },
+            session=txn,
+        )
+    except Exception:
+        if txn is None:
+            # No transaction to roll back: hand the reserved seats back ourselves
+            await SESSION_COL.update_one({"_id": sid}, {"$inc": {"booked_seats": -payload.seats}})
+        raise
 
     # Simulate sending email notifications (stored as logs)
-    create_document(
+    await create_document(
         "email",
         {
             "type": "booking_created",
@@ -253,113 +307,199 @@ def create_booking(payload: BookingRequest):
             "subject": "Your HANDIQ booking is almost complete",
             "booking_id": booking_id,
         },
+        session=txn,
     )
+    return booking_id
+
+
+@app.post("/api/bookings")
+async def create_booking(payload: BookingRequest):
+    # Workshop price comes from the read cache, so no workshop round-trip here
+    w = await cached_workshop(payload.workshop_slug)
+    if not w:
+        raise HTTPException(404, "Workshop not found")
+    sid = oid(payload.session_id)
+    amount = float(w.get("price", 0)) * payload.seats
 
+    # Seat reservation, booking and email log commit or roll back together
+    booking_id = await run_in_transaction(lambda txn: _reserve_and_book(payload, sid, amount, txn))
+
+    await cache_delete(f"sessions:{payload.workshop_slug}")
     return {"booking_id": booking_id, "amount": amount, "currency": "INR"}
 
 
 @app.get("/api/bookings/{booking_id}")
-def get_booking(booking_id: str):
-    b = db["booking"].find_one({"_id": oid(booking_id)})
+async def get_booking(booking_id: str):
+    b = await BOOKING_COL.find_one({"_id": oid(booking_id)})
     if not b:
         raise HTTPException(404, "Booking not found")
     # attach session & workshop
-    s = db["session"].find_one({"_id": oid(b["session_id"])})
-    w = db["workshop"].find_one({"slug": b["workshop_slug"]})
+    s = await SESSION_COL.find_one({"_id": oid(b["session_id"])})
+    w = await WORKSHOP_COL.find_one({"slug": b["workshop_slug"]})
     data = serialize(b)
     data["session"] = serialize(s) if s else None
     data["workshop"] = serialize(w) if w else None
     return data
 
 
+@app.post("/api/bookings/{booking_id}/cancel")
+async def cancel_booking(booking_id: str):
+    bid = oid(booking_id)
+
+    async def cancel(txn=None):
+        b = await BOOKING_COL.find_one_and_update(
+            {"_id": bid, "status": {"$in": ["pending_payment", "confirmed"]}},
+            {"$set": {"status": "cancelled"}},
+            session=txn,
+        )
+        if b:
+            # release the seats held by this booking, in the same transaction
+            await SESSION_COL.update_one({"_id": oid(b["session_id"])}, {"$inc": {"booked_seats": -b["seats"]}}, session=txn)
+        return b
+
+    b = await run_in_transaction(cancel)
+    if not b:
+        if await BOOKING_COL.count_documents({"_id": bid}, limit=1) == 0:
+            raise HTTPException(404, "Booking not found")
+        return {"status": "already_cancelled"}
+    await cache_delete(f"sessions:{b['workshop_slug']}")
+    return {"status": "cancelled"}
+
+
 @app.post("/api/payments/checkout")
-def initiate_payment(booking_id: str):  # simple mock to return a dummy payment token
-    b = db["booking"].find_one({"_id": oid(booking_id)})
+async def initiate_payment(booking_id: str):  # simple mock to return a dummy payment token
+    b = await BOOKING_COL.find_one({"_id": oid(booking_id)})
     if not b:
         raise HTTPException(404, "Booking not found")
     if b["status"] == "confirmed":
         return {"status": "already_paid"}
-    token = f"PAY_{booking_id[-6:]}"
+    # One token per booking, stored on the booking so every worker hands out the same one
+    token = b.get("payment_token")
+    if not token:
+        candidate = f"PAY_{secrets.token_hex(8)}"
+        res = await BOOKING_COL.update_one(
+            {"_id": b["_id"], "payment_token": {"$exists": False}},
+            {"$set": {"payment_token": candidate}},
+        )
+        if res.modified_count:
+            token = candidate
+        else:
+            # A concurrent checkout set it first
+            token = (await BOOKING_COL.find_one({"_id": b["_id"]}, {"payment_token": 1}))["payment_token"]
     return {"payment_token": token, "amount": b["amount"], "currency": "INR"}
 
 
 @app.post("/api/payments/confirm")
-def confirm_payment(payload: PaymentConfirmRequest):
-    res = db["booking"].update_one({"_id": oid(payload.booking_id)}, {"$set": {"status": "confirmed", "payment_reference": payload.payment_reference}})
-    if res.matched_count == 0:
-        raise HTTPException(404, "Booking not found")
+async def confirm_payment(payload: PaymentConfirmRequest):
+    # Only pending bookings still hold their seats; cancelled ones must not be revived
+    b = await BOOKING_COL.find_one_and_update(
+        {"_id": oid(payload.booking_id), "status": "pending_payment"},
+        {"$set": {"status": "confirmed", "payment_reference": payload.payment_reference}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if not b:
+        current = await BOOKING_COL.find_one({"_id": oid(payload.booking_id)}, {"status": 1})
+        if not current:
+            raise HTTPException(404, "Booking not found")
+        if current["status"] == "confirmed":
+            return {"status": "already_paid"}
+        raise HTTPException(409, f"Booking is {current['status']}")
 
     # Send emails: confirmation to customer and notification to admin
-    b = db["booking"].find_one({"_id": oid(payload.booking_id)})
-    create_document(
-        "email",
-        {
-            "type": "booking_confirmed",
-            "to": b.get("customer_email"),
-            "subject": "HANDIQ Booking Confirmed",
-            "booking_id": payload.booking_id,
-            "payment_reference": payload.payment_reference,
-        },
-    )
-    create_document(
+    await create_documents(
         "email",
-        {
-            "type": "admin_new_booking",
-            "to": "admin@handiq.example",
-            "subject": "New HANDIQ Booking",
-            "booking_id": payload.booking_id,
-        },
+        [
+            {
+                "type": "booking_confirmed",
+                "to": b.get("customer_email"),
+                "subject": "HANDIQ Booking Confirmed",
+                "booking_id": payload.booking_id,
+                "payment_reference": payload.payment_reference,
+            },
+            {
+                "type": "admin_new_booking",
+                "to": "admin@handiq.example",
+                "subject": "New HANDIQ Booking",
+                "booking_id": payload.booking_id,
+            },
+        ],
     )
     return {"status": "confirmed"}
 
 
 @app.get("/api/reviews")
-def get_reviews(workshop_slug: Optional[str] = None, limit: int = 10):
+async def get_reviews(request: Request, workshop_slug: Optional[str] = None, limit: int = Query(10, ge=1, le=100)):
     q = {"workshop_slug": workshop_slug} if workshop_slug else {}
-    items = db["review"].find(q).sort("created_at", -1).limit(limit)
-    return {"items": [serialize(i) for i in items]}
+    cursor = REVIEW_COL.find(q, batch_size=limit).sort("created_at", -1).limit(limit)
+    items = [serialize(i) async for i in cursor]
+    return conditional_response(request, {"items": items})
 
 
 @app.post("/api/reviews")
-def add_review(workshop_slug: str, name: str, rating: int, comment: str):
+async def add_review(workshop_slug: str, name: str, rating: int, comment: str):
     if rating < 1 or rating > 5:
         raise HTTPException(400, "Rating must be 1-5")
-    rid = create_document("review", {"workshop_slug": workshop_slug, "name": name, "rating": rating, "comment": comment})
+    rid = await create_document("review", {"workshop_slug": workshop_slug, "name": name, "rating": rating, "comment": comment})
     return {"id": rid}
 
 
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available" if db is None else "✅ Connected",
     }
     if db is not None:
-        response["collections"] = db.list_collection_names()
+        response["collections"] = await db.list_collection_names()
     return response
 
 
 # Simple reminder generator endpoint (simulate cron)
 @app.post("/admin/send-reminders")
-def send_reminders():
-    now = datetime.now(timezone.utc)
+async def send_reminders():
+    now = datetime.now(UTC)
     in_24h = now + timedelta(hours=24)
-    sessions = db["session"].find({"start_time": {"$gte": now, "$lte": in_24h}})
-    count = 0
-    for s in sessions:
-        bookings = db["booking"].find({"session_id": str(s["_id"]), "status": "confirmed"})
-        for b in bookings:
-            create_document(
-                "email",
-                {
-                    "type": "reminder",
-                    "to": b.get("customer_email"),
-                    "subject": "Reminder: Your HANDIQ workshop is in 24 hours",
-                    "booking_id": str(b["_id"]),
-                },
-            )
-            count += 1
-    return {"reminders_created": count}
+    # Join upcoming sessions to their confirmed bookings server-side.
+    # Bookings store session_id as a string, so match on the stringified _id.
+    bookings = SESSION_COL.aggregate([
+        {"$match": {"start_time": {"$gte": now, "$lte": in_24h}}},
+        {"$project": {"sid": {"$toString": "$_id"}}},
+        # Equality join so the booking (session_id, status) index is used
+        {"$lookup": {"from": "booking", "localField": "sid", "foreignField": "session_id", "as": "booking"}},
+        {"$unwind": "$booking"},
+        {"$match": {"booking.status": "confirmed"}},
+        {"$replaceRoot": {"newRoot": "$booking"}},
+        {"$project": {"customer_email": 1}},
+    ])
+    email_docs = [
+        {
+            "type": "reminder",
+            "to": b.get("customer_email"),
+            "subject": "Reminder: Your HANDIQ workshop is in 24 hours",
+            "booking_id": str(b["_id"]),
+        }
+        async for b in bookings
+    ]
+    await create_documents("email", email_docs, ordered=False)
+    return {"reminders_created": len(email_docs)}
+
+
+@app.get("/admin/session-availability")
+async def session_availability(limit: int = Query(500, ge=1, le=1000)):
+    now = datetime.now(UTC)
+    # Availability is derived from the denormalized booked_seats counter in the projection
+    sessions = SESSION_COL.find(
+        {"start_time": {"$gte": now}},
+        {
+            "workshop_slug": 1,
+            "start_time": 1,
+            "capacity": 1,
+            "booked_seats": {"$ifNull": ["$booked_seats", 0]},
+            "available_seats": {"$max": [0, {"$subtract": ["$capacity", {"$ifNull": ["$booked_seats", 0]}]}]},
+        },
+    ).sort("start_time", 1).limit(limit)
+    items = await sessions.to_list(length=limit)
+    return {"items": [serialize(s) for s in items]}
 
 
 if __name__ == "__main__":
@@ -29,6 +29,7 @@ class Session(BaseModel):
     start_time: datetime
     end_time: datetime
     capacity: int = Field(..., ge=1)
+    booked_seats: int = Field(0, ge=0, description="Seats held by pending or confirmed bookings")
 
 
 class Booking(BaseModel):
@@ -41,6 +42,7 @@ class Booking(BaseModel):
     amount: float
     status: str = Field("pending_payment", description="pending_payment | confirmed | cancelled | failed")
     payment_reference: Optional[str] = None
+    payment_token: Optional[str] = None
 
 
 class Review(BaseModel):
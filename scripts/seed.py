@@ -0,0 +1,103 @@
+"""
+Seed HANDIQ workshops and rolling sessions.
+
+Run once per deploy, not on every worker boot:
+
+    python -m scripts.seed            # only seeds empty collections
+    python -m scripts.seed --force    # refresh workshops and replace upcoming unbooked sessions
+
+Every run also backfills booked_seats on sessions that predate the counter.
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from cache import cache_delete_prefix
+from database import db, create_documents, ensure_indexes
+from seed_data import WORKSHOPS
+
+
+async def backfill_booked_seats():
+    # Sessions created before booked_seats existed get the count of seats their
+    # pending/confirmed bookings already hold; sessions with the field are left alone.
+    held = db["booking"].aggregate([
+        {"$match": {"status": {"$in": ["pending_payment", "confirmed"]}}},
+        {"$group": {"_id": "$session_id", "seats": {"$sum": "$seats"}}},
+    ])
+    ops = [
+        UpdateOne({"_id": ObjectId(h["_id"]), "booked_seats": {"$exists": False}}, {"$set": {"booked_seats": h["seats"]}})
+        async for h in held
+        if ObjectId.is_valid(h["_id"])
+    ]
+    if ops:
+        await db["session"].bulk_write(ops, ordered=False)
+    await db["session"].update_many({"booked_seats": {"$exists": False}}, {"$set": {"booked_seats": 0}})
+
+
+async def drop_unbooked_sessions(now: datetime):
+    # Upcoming seed sessions nobody has booked (not even a since-cancelled booking)
+    upcoming = db["session"].find(
+        {"workshop_slug": {"$in": [w["slug"] for w in WORKSHOPS]}, "start_time": {"$gte": now}, "booked_seats": 0},
+        {"_id": 1},
+    )
+    ids = [s["_id"] async for s in upcoming]
+    if not ids:
+        return
+    referenced = set(await db["booking"].distinct("session_id", {"session_id": {"$in": [str(i) for i in ids]}}))
+    # Re-check booked_seats in the delete itself: a booking may have landed since the read
+    await db["session"].delete_many({"_id": {"$in": [i for i in ids if str(i) not in referenced]}, "booked_seats": 0})
+
+
+async def ensure_seed(force: bool = False):
+    if db is None:
+        raise SystemExit("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    await ensure_indexes()
+    await backfill_booked_seats()
+    if force or await db["workshop"].count_documents({}) == 0:
+        # Upsert by slug: the live API never sees a workshop missing and _ids stay stable
+        now = datetime.now(timezone.utc)
+        await db["workshop"].bulk_write([
+            UpdateOne(
+                {"slug": w["slug"]},
+                {"$set": {**w, "updated_at": now}, "$setOnInsert": {"created_at": now}},
+                upsert=True,
+            )
+            for w in WORKSHOPS
+        ])
+        # Only reaches the API's cache through Redis; without REDIS_URL workers
+        # keep serving their cached workshops until WORKSHOP_TTL expires
+        await cache_delete_prefix("workshop:")
+    # Seed rolling sessions for next days
+    now = datetime.now(timezone.utc)
+    if force:
+        await drop_unbooked_sessions(now)
+    if force or await db["session"].count_documents({}) == 0:
+        durations = {w["slug"]: timedelta(minutes=w["duration_minutes"]) for w in WORKSHOPS}
+        day_starts = [now + timedelta(days=d, hours=10) for d in range(1, 10)]
+        session_docs = [
+            {
+                "workshop_slug": slug,
+                "start_time": start,
+                "end_time": start + duration,
+                "capacity": 10,
+                "booked_seats": 0,
+            }
+            for slug, duration in durations.items()
+            for start in day_starts
+        ]
+        await create_documents("session", session_docs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed HANDIQ workshops and sessions")
+    parser.add_argument("--force", action="store_true", help="seed even if the collections already have data")
+    args = parser.parse_args()
+    asyncio.run(ensure_seed(force=args.force))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Seed Data for HANDIQ Creative Workshops
+
+Built-in workshops inserted by `python -m scripts.seed`.
+"""
+
+WORKSHOPS = [
+    {
+        "title": "Scrapbooking Workshop",
+        "slug": "scrapbooking",
+        "description": "Create calming, memory-filled pages with premium papers and embellishments.",
+        "price": 1999.0,
+        "duration_minutes": 120,
+        "location": "HANDIQ Studio, Indiranagar",
+        "instructor": "Aisha Kapoor",
+        "includes": ["All materials", "Tea & snacks", "Take-home kit"],
+        "images": [
+            "https://images.unsplash.com/photo-1519681393784-d120267933ba",
+        ],
+        "what_you_learn": ["Layering", "Composition", "Binding"],
+        "materials_provided": ["Papers", "Stickers", "Glue", "Cutters"],
+        "accent_color": "#B58E6D",
+    },
+    {
+        "title": "Pottery Workshop",
+        "slug": "pottery",
+        "description": "Mindful clay play: hand-building, wheel basics, glazing.",
+        "price": 2499.0,
+        "duration_minutes": 150,
+        "location": "HANDIQ Studio, Indiranagar",
+        "instructor": "Raghav Menon",
+        "includes": ["Clay & tools", "Firing & glazing", "Refreshments"],
+        "images": [
+            "https://images.unsplash.com/photo-1513342791620-8d83f05df3fc",
+        ],
+        "what_you_learn": ["Coiling", "Pinching", "Wheel basics"],
+        "materials_provided": ["Clay", "Tools", "Apron"],
+        "accent_color": "#3F6E73",
+    },
+    {
+        "title": "Resin Art Workshop",
+        "slug": "resin-art",
+        "description": "Create glossy, ocean-like pours with resin and pigments.",
+        "price": 2899.0,
+        "duration_minutes": 120,
+        "location": "HANDIQ Studio, Indiranagar",
+        "instructor": "Naina Shah",
+        "includes": ["Resin & pigments", "Safety gear", "Coasters to take home"],
+        "images": [
+            "https://images.unsplash.com/photo-1604076936065-c6e5f0505f01",
+        ],
+        "what_you_learn": ["Mixing", "Pouring", "Finishing"],
+        "materials_provided": ["Resin", "Pigments", "Gloves", "Masks"],
+        "accent_color": "#F5B21A",
+    },
+    {
+        "title": "Embroidery Workshop",
+        "slug": "embroidery",
+        "description": "Slow-stitch your calm with modern embroidery techniques.",
+        "price": 1799.0,
+        "duration_minutes": 120,
+        "location": "HANDIQ Studio, Indiranagar",
+        "instructor": "Meera Iyer",
+        "includes": ["Hoop, needles, threads", "Design templates", "Snacks"],
+        "images": [
+            "https://images.unsplash.com/photo-1600431521340-491eca880813",
+        ],
+        "what_you_learn": ["Backstitch", "Satin stitch", "French knots"],
+        "materials_provided": ["Hoop", "Fabric", "Threads", "Needles"],
+        "accent_color": "#E8DCCF",
+    },
+]
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Exercise the in-process cache and no-database code paths, never a live server
+for var in ("DATABASE_URL", "DATABASE_NAME", "REDIS_URL"):
+    os.environ.pop(var, None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,293 @@
+import asyncio
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import OperationFailure
+from starlette.requests import Request
+
+import cache
+import main
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_request(if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def booking_payload(seats=2, slug="pottery"):
+    return main.BookingRequest(
+        workshop_slug=slug,
+        session_id=str(ObjectId()),
+        customer_name="Asha",
+        customer_email="asha@example.com",
+        seats=seats,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    cache._local.clear()
+    yield
+    cache._local.clear()
+
+
+# ----- oid -----
+
+def test_oid_accepts_24_hex_chars():
+    value = str(ObjectId())
+    assert str(main.oid(value)) == value
+    assert str(main.oid(value.upper())) == value
+
+
+@pytest.mark.parametrize("value", ["", "abc", "z" * 24, "0" * 23, "0" * 25, "0" * 24 + "\n"])
+def test_oid_rejects_malformed_ids(value):
+    with pytest.raises(HTTPException) as exc:
+        main.oid(value)
+    assert exc.value.status_code == 400
+
+
+# ----- conditional_response -----
+
+def test_conditional_response_sets_etag_and_cache_control():
+    res = main.conditional_response(make_request(), {"items": [1]})
+    assert res.status_code == 200
+    assert res.body == main.dumps({"items": [1]})
+    assert res.headers["etag"] == main.make_etag(res.body)
+    assert res.headers["cache-control"] == "public, max-age=60"
+
+
+@pytest.mark.parametrize("header", ["{etag}", 'W/{etag}', '"other", {etag}', '"other",W/{etag}'])
+def test_conditional_response_matching_if_none_match_gives_304(header):
+    etag = main.make_etag(main.dumps({"items": []}))
+    res = main.conditional_response(make_request(header.format(etag=etag)), {"items": []})
+    assert res.status_code == 304
+    assert res.body == b""
+    assert res.headers["etag"] == etag
+
+
+def test_conditional_response_stale_if_none_match_gives_body():
+    res = main.conditional_response(make_request('"stale"'), {"items": []}, cache_control="private, no-cache")
+    assert res.status_code == 200
+    assert res.headers["cache-control"] == "private, no-cache"
+
+
+def test_conditional_response_uses_given_etag():
+    res = main.conditional_response(make_request('"given"'), b"{}", etag='"given"')
+    assert res.status_code == 304
+
+
+# ----- cached / cached_workshops_body -----
+
+def test_cached_workshops_body_packs_etag_with_body(monkeypatch):
+    calls = []
+
+    async def fake_get_documents(collection, filter_dict=None, limit=None, projection=None):
+        calls.append(collection)
+        return [{"_id": ObjectId("0123456789abcdef01234567"), "slug": "pottery"}]
+
+    monkeypatch.setattr(main, "get_documents", fake_get_documents)
+    body, etag = run(main.cached_workshops_body())
+    assert body == main.dumps({"items": [{"slug": "pottery", "id": "0123456789abcdef01234567"}]})
+    assert etag == main.make_etag(body)
+    assert len(etag) == main._ETAG_LEN
+
+    # Second call is served from the cache
+    assert run(main.cached_workshops_body()) == (body, etag)
+    assert calls == ["workshop"]
+
+
+def test_cached_does_not_store_missing_values():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return None
+
+    assert run(main.cached("workshop:missing", load, 60)) is None
+    assert run(main.cached("workshop:missing", load, 60)) is None
+    assert len(calls) == 2
+
+
+def test_cached_shares_one_load_between_concurrent_misses():
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return {"v": 1}
+
+    async def both():
+        return await asyncio.gather(main.cached("k", load, 60), main.cached("k", load, 60))
+
+    assert run(both()) == [{"v": 1}, {"v": 1}]
+    assert len(calls) == 1
+
+
+# ----- BookingRequest -----
+
+@pytest.mark.parametrize("seats", [0, -50, 11])
+def test_booking_request_rejects_out_of_range_seats(seats):
+    with pytest.raises(ValidationError):
+        booking_payload(seats=seats)
+
+
+# ----- _reserve_and_book -----
+
+class FakeSessions:
+    def __init__(self, updated=None, current=None):
+        self.updated = updated
+        self.current = current
+        self.updates = []
+
+    async def find_one_and_update(self, *args, **kwargs):
+        return self.updated
+
+    async def find_one(self, *args, **kwargs):
+        return self.current
+
+    async def update_one(self, filter_dict, update, **kwargs):
+        self.updates.append((filter_dict, update))
+
+
+def stub_inserts(monkeypatch, fail_on=None):
+    inserted = []
+
+    async def fake_create_document(collection, data, session=None):
+        if collection == fail_on:
+            raise RuntimeError("insert failed")
+        inserted.append((collection, data, session))
+        return "b1"
+
+    monkeypatch.setattr(main, "create_document", fake_create_document)
+    return inserted
+
+
+def test_reserve_and_book_unknown_session(monkeypatch):
+    monkeypatch.setattr(main, "SESSION_COL", FakeSessions(updated=None, current=None))
+    with pytest.raises(HTTPException) as exc:
+        run(main._reserve_and_book(booking_payload(), ObjectId(), 10.0))
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Invalid session"
+
+
+def test_reserve_and_book_session_of_other_workshop(monkeypatch):
+    current = {"workshop_slug": "resin-art", "capacity": 10, "booked_seats": 0}
+    monkeypatch.setattr(main, "SESSION_COL", FakeSessions(updated=None, current=current))
+    with pytest.raises(HTTPException) as exc:
+        run(main._reserve_and_book(booking_payload(), ObjectId(), 10.0))
+    assert exc.value.detail == "Invalid session"
+
+
+def test_reserve_and_book_not_enough_seats(monkeypatch):
+    current = {"workshop_slug": "pottery", "capacity": 10, "booked_seats": 9}
+    monkeypatch.setattr(main, "SESSION_COL", FakeSessions(updated=None, current=current))
+    inserted = stub_inserts(monkeypatch)
+    with pytest.raises(HTTPException) as exc:
+        run(main._reserve_and_book(booking_payload(seats=2), ObjectId(), 10.0))
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Only 1 seats left"
+    assert inserted == []
+
+
+def test_reserve_and_book_success(monkeypatch):
+    sessions = FakeSessions(updated={"booked_seats": 2})
+    monkeypatch.setattr(main, "SESSION_COL", sessions)
+    inserted = stub_inserts(monkeypatch)
+    assert run(main._reserve_and_book(booking_payload(), ObjectId(), 10.0, txn="txn")) == "b1"
+    assert [(c, s) for c, _, s in inserted] == [("booking", "txn"), ("email", "txn")]
+    assert inserted[0][1]["seats"] == 2
+    assert sessions.updates == []
+
+
+def test_reserve_and_book_releases_seats_without_transaction(monkeypatch):
+    sessions = FakeSessions(updated={"booked_seats": 2})
+    monkeypatch.setattr(main, "SESSION_COL", sessions)
+    stub_inserts(monkeypatch, fail_on="booking")
+    sid = ObjectId()
+    with pytest.raises(RuntimeError):
+        run(main._reserve_and_book(booking_payload(seats=2), sid, 10.0))
+    assert sessions.updates == [({"_id": sid}, {"$inc": {"booked_seats": -2}})]
+
+
+def test_reserve_and_book_leaves_rollback_to_transaction(monkeypatch):
+    sessions = FakeSessions(updated={"booked_seats": 2})
+    monkeypatch.setattr(main, "SESSION_COL", sessions)
+    stub_inserts(monkeypatch, fail_on="booking")
+    with pytest.raises(RuntimeError):
+        run(main._reserve_and_book(booking_payload(), ObjectId(), 10.0, txn="txn"))
+    assert sessions.updates == []
+
+
+# ----- run_in_transaction -----
+
+class FakeSession:
+    def __init__(self, error=None):
+        self.error = error
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def with_transaction(self, fn):
+        if self.error:
+            raise self.error
+        return await fn(self)
+
+
+class FakeDB:
+    def __init__(self, error=None):
+        session = FakeSession(error)
+
+        class Client:
+            async def start_session(self):
+                return session
+
+        self.client = Client()
+
+
+def test_run_in_transaction_passes_session(monkeypatch):
+    monkeypatch.setattr(main, "db", FakeDB())
+    monkeypatch.setattr(main, "_transactions_supported", True)
+
+    async def fn(txn):
+        return txn
+
+    assert isinstance(run(main.run_in_transaction(fn)), FakeSession)
+
+
+def test_run_in_transaction_falls_back_on_standalone(monkeypatch):
+    monkeypatch.setattr(main, "db", FakeDB(OperationFailure("Transaction numbers are only allowed on a replica set", code=20)))
+    monkeypatch.setattr(main, "_transactions_supported", True)
+    seen = []
+
+    async def fn(txn):
+        seen.append(txn)
+        return "ok"
+
+    assert run(main.run_in_transaction(fn)) == "ok"
+    assert seen == [None]
+    assert main._transactions_supported is False
+
+    # Later calls skip the transaction attempt entirely
+    assert run(main.run_in_transaction(fn)) == "ok"
+    assert seen == [None, None]
+
+
+def test_run_in_transaction_reraises_other_failures(monkeypatch):
+    monkeypatch.setattr(main, "db", FakeDB(OperationFailure("boom", code=112)))
+    monkeypatch.setattr(main, "_transactions_supported", True)
+
+    async def fn(txn):
+        return "ok"
+
+    with pytest.raises(OperationFailure):
+        run(main.run_in_transaction(fn))
+    assert main._transactions_supported is True